@@ -151,13 +151,13 @@ class BasicClient:
             self.connection.stop()
 
     async def _connect(self, hostname, port, reconnect=False, channels=None,
-                       encoding=protocol.DEFAULT_ENCODING, source_address=None):
+                       encoding=protocol.DEFAULT_ENCODING, source_address=None, sockopts=None):
         """ Connect to IRC host. """
         # Create connection if we can't reuse it.
         if not reconnect or not self.connection:
             self._autojoin_channels = channels or []
             self.connection = connection.Connection(hostname, port, source_address=source_address,
-                                                    eventloop=self.eventloop)
+                                                    sockopts=sockopts, eventloop=self.eventloop)
             self.encoding = encoding
 
         # Connect.
@@ -179,9 +179,10 @@ class BasicClient:
         }
 
     def _destroy_channel(self, channel):
-        # Copy set to prevent a runtime error when destroying the user.
-        for user in set(self.channels[channel]['users']):
-            self._destroy_user(user, channel)
+        # Drain the set instead of iterating over a copy: popping the user first means _destroy_user() won't mutate it.
+        users = self.channels[channel]['users']
+        while users:
+            self._destroy_user(users.pop(), channel)
         del self.channels[channel]
 
     def _create_user(self, nickname):
@@ -193,22 +194,28 @@ class BasicClient:
             'nickname': nickname,
             'username': None,
             'realname': None,
-            'hostname': None
+            'hostname': None,
+            # Internal: nick!user@host, formatted on demand by _format_user_mask() and dropped whenever the user changes.
+            '_hostmask': None
         }
 
     async def _sync_user(self, nick, metadata):
         # Create user in database.
-        if nick not in self.users:
+        user = self.users.get(nick)
+        if user is None:
             await self._create_user(nick)
-            if nick not in self.users:
+            user = self.users.get(nick)
+            if user is None:
                 return
-        self.users[nick].update(metadata)
+        user.update(metadata)
+        user['_hostmask'] = None
 
     async def _rename_user(self, user, new):
         if user in self.users:
             self.users[new] = self.users[user]
             self.users[new]['nickname'] = new
             del self.users[user]
+            self.users[new]['_hostmask'] = None
         else:
             await self._create_user(new)
             if new not in self.users:
@@ -240,9 +247,15 @@ class BasicClient:
         raise NotImplementedError()
 
     def _format_user_mask(self, nickname):
-        user = self.users.get(nickname, {"nickname": nickname, "username": "*", "hostname": "*"})
-        return self._format_host_mask(user['nickname'], user['username'] or '*',
-                                      user['hostname'] or '*')
+        user = self.users.get(nickname)
+        if user is None:
+            return self._format_host_mask(nickname, '*', '*')
+
+        # Formatted on first use after the user changed, and reused until it changes again.
+        if not user.get('_hostmask'):
+            user['_hostmask'] = self._format_host_mask(user['nickname'], user['username'] or '*',
+                                                       user['hostname'] or '*')
+        return user['_hostmask']
 
     def _format_host_mask(self, nick, user, host):
         return '{n}!{u}@{h}'.format(n=nick, u=user, h=host)
@@ -255,7 +268,7 @@ class BasicClient:
 
     def in_channel(self, channel):
         """ Check if we are currently in the given channel. """
-        return channel in self.channels.keys()
+        return channel in self.channels
 
     def is_same_nick(self, left, right):
         """ Check if given nicknames are equal. """
@@ -290,9 +303,7 @@ class BasicClient:
                     host, suffix = tag.rsplit('.', 1)
 
                     # Make sure we aren't cutting off the last octet of an IPv4.
-                    try:
-                        int(suffix)
-                    except ValueError:
+                    if not suffix.isdecimal():
                         tag = host
 
             return tag
@@ -355,7 +366,9 @@ class BasicClient:
         if isinstance(input, str):
             input = input.encode(self.encoding)
 
-        self.logger.debug('>> %s', input.decode(self.encoding))
+        # Avoid decoding the outgoing line again just to throw it away when debug logging is off.
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('>> %s', input.decode(self.encoding))
         await self.connection.send(input)
 
     async def handle_forever(self):
@@ -370,8 +383,13 @@ class BasicClient:
                 try:
                     await self.rawmsg("PING", self.server_tag)
                     data = await self.connection.recv(timeout=self.READ_TIMEOUT)
-                except (asyncio.TimeoutError, ConnectionResetError):
+                except (asyncio.TimeoutError, ConnectionResetError, protocol.ProtocolViolation):
                     data = None
+            except protocol.ProtocolViolation as e:
+                # The server sent an overly long line. Tear down the connection right here like on EOF,
+                # so this loop is guaranteed to end rather than carry on alongside the one a reconnect starts.
+                self.logger.error('Encountered error on socket.', exc_info=(type(e), e, None))
+                data = None
 
             if not data:
                 if self.connected:
@@ -402,13 +420,8 @@ class BasicClient:
             self.logger.warning('Encountered strictly invalid IRC message from server: %s',
                                 message._raw)
 
-        if isinstance(message.command, int):
-            cmd = str(message.command).zfill(3)
-        else:
-            cmd = message.command
-
         # Invoke dispatcher, if we have one.
-        method = 'on_raw_' + cmd.lower()
+        method = 'on_raw_' + message.dispatch_key
         try:
             # Set _top_level so __getattr__() can decide whether to return on_unknown or _ignored for unknown handlers.
             # The reason for this is that features can always call super().on_raw_* safely and thus don't need to care for other features,
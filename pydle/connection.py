@@ -1,8 +1,11 @@
 import asyncio
 import os.path as path
+import socket
 import ssl
 import sys
 
+from . import protocol
+
 __all__ = ['Connection']
 
 DEFAULT_CA_PATHS = {
@@ -11,20 +14,48 @@ DEFAULT_CA_PATHS = {
     'freebsd': '/etc/ssl/certs'
 }
 
+# Resolved once: whether the platform's CA directory exists won't change while we're running.
+if sys.platform in DEFAULT_CA_PATHS and path.isdir(DEFAULT_CA_PATHS[sys.platform]):
+    PLATFORM_CA_PATH = DEFAULT_CA_PATHS[sys.platform]
+else:
+    PLATFORM_CA_PATH = None
+
+# Relevant TLS options, as far as supported by the ssl module:
+# - No server should use SSLv2 or SSLv3 any more, they are outdated and full of security holes. (RFC6176, RFC7568)
+# - Disable compression in order to counter the CRIME attack. (https://en.wikipedia.org/wiki/CRIME_%28security_exploit%29)
+# - Disable session resumption to maintain perfect forward secrecy. (https://timtaubert.de/blog/2014/11/the-sad-state-of-server-side-tls-session-resumption-implementations/)
+TLS_OPTIONS = 0
+for opt in ['NO_SSLv2', 'NO_SSLv3', 'NO_COMPRESSION', 'NO_TICKET']:
+    TLS_OPTIONS |= getattr(ssl, 'OP_' + opt, 0)
+del opt
+
 MESSAGE_THROTTLE_TRESHOLD = 3
 MESSAGE_THROTTLE_DELAY = 2
+SEND_BUFFER_HIGH_WATER = 64 * 1024
+# Large enough to take everything the stream has buffered (64 KiB by default) in one go during bursts like NAMES or MOTD.
+BUFFER_SIZE = 64 * 1024
+# Incomplete lines longer than this are refused, so a misbehaving server can't make them pile up indefinitely.
+PARTIAL_LINE_LIMIT = 64 * 1024
+KEEPALIVE_IDLE_MIN = 30
+KEEPALIVE_INTERVAL = 15
+KEEPALIVE_PROBES = 4
 
 
 class Connection:
     """ A TCP connection over the IRC protocol. """
     CONNECT_TIMEOUT = 10
 
+    # TLS contexts by (verify, certificate file, key file, password), shared among all connections.
+    _tls_contexts = {}
+
     def __init__(self, hostname, port, tls=False, tls_verify=True, tls_certificate_file=None,
                  tls_certificate_keyfile=None, tls_certificate_password=None, ping_timeout=240,
-                 source_address=None, eventloop=None):
+                 source_address=None, sockopts=None, eventloop=None):
         self.hostname = hostname
         self.port = port
         self.source_address = source_address
+        # Extra (level, option, value) socket options, applied verbatim on connect.
+        self.sockopts = sockopts or []
         self.ping_timeout = ping_timeout
 
         self.tls = tls
@@ -36,55 +67,97 @@ class Connection:
 
         self.reader = None
         self.writer = None
-        self.eventloop = eventloop or asyncio.new_event_loop()
+        self.eventloop = eventloop
+
+        self._send_buffer = bytearray()
+        self._send_flush_handle = None
+        self._recv_buffer = bytearray()
+        self._recv_pos = 0
 
     async def connect(self):
         """ Connect to target. """
         self.tls_context = None
+        self._recv_buffer.clear()
+        self._recv_pos = 0
 
         if self.tls:
             self.tls_context = self.create_tls_context()
 
+        # Default to the loop we're being connected from, rather than setting up one of our own.
+        if not self.eventloop:
+            self.eventloop = asyncio.get_event_loop()
+
         (self.reader, self.writer) = await asyncio.open_connection(
             host=self.hostname,
             port=self.port,
             local_addr=self.source_address,
             ssl=self.tls_context,
-            loop=self.eventloop
+            limit=PARTIAL_LINE_LIMIT
         )
 
+        # Have the transport ask us to hold off (see send()) at the same point we'd flush anyway.
+        self.writer.transport.set_write_buffer_limits(high=SEND_BUFFER_HIGH_WATER)
+
+        # IRC is line-based and latency-sensitive: don't let Nagle's algorithm hold back small writes.
+        # Newer asyncio versions do this by default, older ones don't.
+        sock = self.writer.get_extra_info('socket')
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._setup_keepalive(sock)
+
+        # Buffer sizes are deliberately left to the kernel, as setting them disables autotuning.
+        # Those who know better for their link can still override them (or anything else) here.
+        if sock is not None:
+            for level, option, value in self.sockopts:
+                sock.setsockopt(level, option, value)
+
+    def _setup_keepalive(self, sock):
+        """ Enable TCP keepalive, with timers tight enough to notice a dead peer within the ping timeout. """
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        # The OS defaults typically wait hours before probing. Not every platform lets us change them.
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, max(KEEPALIVE_IDLE_MIN, self.ping_timeout // 4))
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+        if hasattr(socket, 'TCP_KEEPCNT'):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_PROBES)
+
     def create_tls_context(self):
         """ Transform our regular socket into a TLS socket. """
-        # Create context manually, as we're going to set our own options.
-        tls_context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+        # Setting up a context means loading certificate stores and chains, so share them between connections.
+        key = (self.tls_verify, self.tls_certificate_file, self.tls_certificate_keyfile,
+               self.tls_certificate_password)
+        if key not in self._tls_contexts:
+            self._tls_contexts[key] = self._create_tls_context()
+        return self._tls_contexts[key]
+
+    def _create_tls_context(self):
+        # Set TLS verification options.
+        if self.tls_verify:
+            # The default context already loads the system certificate store and requires a valid, matching certificate.
+            tls_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+            # That is, the store OpenSSL was built to use, which for an OpenSSL not supplied by the OS
+            # (bundled by conda, built by hand, ...) is not necessarily the system's. So add that explicitly.
+            if PLATFORM_CA_PATH:
+                tls_context.load_verify_locations(capath=PLATFORM_CA_PATH)
+            # Have OpenSSL reject malformed certificates outright, as newer Python versions do by default.
+            tls_context.verify_flags |= getattr(ssl, 'VERIFY_X509_STRICT', 0)
+
+            # We don't check for revocation, because that's impractical still (https://www.imperialviolet.org/2012/02/05/crlsets.html)
+        else:
+            # No point in loading certificate stores we're not going to use.
+            tls_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            tls_context.check_hostname = False
+            tls_context.verify_mode = ssl.CERT_NONE
 
         # Load client/server certificate.
         if self.tls_certificate_file:
             tls_context.load_cert_chain(self.tls_certificate_file, self.tls_certificate_keyfile,
                                         password=self.tls_certificate_password)
 
-        # Set some relevant options:
-        # - No server should use SSLv2 or SSLv3 any more, they are outdated and full of security holes. (RFC6176, RFC7568)
-        # - Disable compression in order to counter the CRIME attack. (https://en.wikipedia.org/wiki/CRIME_%28security_exploit%29)
-        # - Disable session resumption to maintain perfect forward secrecy. (https://timtaubert.de/blog/2014/11/the-sad-state-of-server-side-tls-session-resumption-implementations/)
-        for opt in ['NO_SSLv2', 'NO_SSLv3', 'NO_COMPRESSION', 'NO_TICKET']:
-            if hasattr(ssl, 'OP_' + opt):
-                tls_context.options |= getattr(ssl, 'OP_' + opt)
-
-        # Set TLS verification options.
-        if self.tls_verify:
-            # Load certificate verification paths.
-            tls_context.set_default_verify_paths()
-            if sys.platform in DEFAULT_CA_PATHS and path.isdir(DEFAULT_CA_PATHS[sys.platform]):
-                tls_context.load_verify_locations(capath=DEFAULT_CA_PATHS[sys.platform])
-
-            # If we want to verify the TLS connection, we first need a certicate.
-            tls_context.verify_mode = ssl.CERT_REQUIRED
-
-            # And have python call match_hostname in do_handshake
-            tls_context.check_hostname = True
-
-            # We don't check for revocation, because that's impractical still (https://www.imperialviolet.org/2012/02/05/crlsets.html)
+        # Set some relevant options.
+        tls_context.options |= TLS_OPTIONS
 
         return tls_context
 
@@ -93,6 +166,8 @@ class Connection:
         if not self.connected:
             return
 
+        # Make sure anything still queued (e.g. a QUIT) makes it out.
+        self._flush_send_buffer()
         self.writer.close()
         self.reader = None
         self.writer = None
@@ -108,8 +183,73 @@ class Connection:
 
     async def send(self, data):
         """ Add data to send queue. """
-        self.writer.write(data)
-        await self.writer.drain()
+        if not self.writer:
+            raise ConnectionError('Not connected.')
+
+        # Coalesce everything sent within a single event loop iteration into one write.
+        self._send_buffer += data
+        if not self._send_flush_handle:
+            self._send_flush_handle = self.eventloop.call_soon(self._flush_send_buffer)
+
+        # Only wait for the transport to drain once a substantial amount of data is pending,
+        # counting what the transport couldn't get out to the peer yet as well as what we're still holding.
+        if len(self._send_buffer) + self.writer.transport.get_write_buffer_size() >= SEND_BUFFER_HIGH_WATER:
+            self._flush_send_buffer()
+            await self.writer.drain()
+
+    def _flush_send_buffer(self):
+        """ Write out send queue. """
+        if self._send_flush_handle:
+            self._send_flush_handle.cancel()
+            self._send_flush_handle = None
+
+        # Hand the buffer itself to the transport and start a fresh one, rather than copying it out.
+        # The transport may hold on to (a view of) it, so it must not be modified after this point.
+        data, self._send_buffer = self._send_buffer, bytearray()
+        if data and self.writer:
+            self.writer.write(data)
 
     async def recv(self, *, timeout=None):
-        return await asyncio.wait_for(self.reader.readline(), timeout=timeout)
+        """
+        Receive a single line. Returns an empty bytestring on EOF.
+        Raises a ProtocolViolation if the server sends more than PARTIAL_LINE_LIMIT bytes without a line separator.
+        """
+        # Serve lines left over from an earlier read without waiting on the socket.
+        end = self._recv_buffer.find(b'\n', self._recv_pos) + 1
+        if end:
+            # Still give handlers of earlier lines a chance to run before handing out the next one.
+            await asyncio.sleep(0)
+        else:
+            end = await asyncio.wait_for(self._recv_more(), timeout=timeout)
+
+        line = bytes(memoryview(self._recv_buffer)[self._recv_pos:end])
+        self._recv_pos = end
+
+        # Reclaim consumed space: for free if everything was consumed, else once enough of it has piled up.
+        if self._recv_pos == len(self._recv_buffer):
+            self._recv_buffer.clear()
+            self._recv_pos = 0
+        elif self._recv_pos > BUFFER_SIZE:
+            del self._recv_buffer[:self._recv_pos]
+            self._recv_pos = 0
+
+        return line
+
+    async def _recv_more(self):
+        """ Read from the socket until we have at least one line buffered. Returns where that line ends. """
+        while True:
+            start = len(self._recv_buffer)
+            data = await self.reader.read(BUFFER_SIZE)
+            if not data:
+                # EOF: hand out whatever is left, then signal the end.
+                return len(self._recv_buffer)
+
+            self._recv_buffer += data
+            end = self._recv_buffer.find(b'\n', start) + 1
+            if end:
+                return end
+            if len(self._recv_buffer) - self._recv_pos > PARTIAL_LINE_LIMIT:
+                self._recv_buffer.clear()
+                self._recv_pos = 0
+                raise protocol.ProtocolViolation(
+                    'Incomplete message exceeds receive limit ({} bytes).'.format(PARTIAL_LINE_LIMIT), message=None)
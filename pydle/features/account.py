@@ -9,8 +9,9 @@ class AccountSupport(rfc1459.RFC1459Support):
 
     def _create_user(self, nickname):
         super()._create_user(nickname)
-        if nickname in self.users:
-            self.users[nickname].update({
+        user = self.users.get(nickname)
+        if user is not None:
+            user.update({
                 'account': None,
                 'identified': False
             })
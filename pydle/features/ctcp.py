@@ -1,5 +1,6 @@
 ## ctcp.py
 # Client-to-Client-Protocol (CTCP) support.
+import re
 import pydle
 import pydle.protocol
 from pydle.features import rfc1459
@@ -9,6 +10,16 @@ __all__ = ['CTCPSupport']
 
 CTCP_DELIMITER = '\x01'
 CTCP_ESCAPE_CHAR = '\x16'
+CTCP_ESCAPES = {
+    '\0': '0',
+    '\n': 'n',
+    '\r': 'r',
+    CTCP_ESCAPE_CHAR: CTCP_ESCAPE_CHAR
+}
+# Quote and unquote in a single pass each, so escape characters inserted for one sequence aren't quoted again for another.
+CTCP_ESCAPE_TABLE = str.maketrans({char: CTCP_ESCAPE_CHAR + escape for char, escape in CTCP_ESCAPES.items()})
+CTCP_UNESCAPES = {escape: char for char, escape in CTCP_ESCAPES.items()}
+CTCP_ESCAPE_PATTERN = re.compile(re.escape(CTCP_ESCAPE_CHAR) + '([0nr' + re.escape(CTCP_ESCAPE_CHAR) + '])')
 
 
 class CTCPSupport(rfc1459.RFC1459Support):
@@ -67,8 +78,9 @@ class CTCPSupport(rfc1459.RFC1459Support):
 
             # Find dedicated handler if it exists.
             attr = 'on_ctcp_' + pydle.protocol.identifierify(type)
-            if hasattr(self, attr):
-                await getattr(self, attr)(nick, target, contents)
+            handler = getattr(self, attr, None)
+            if handler is not None:
+                await handler(nick, target, contents)
             # Invoke global handler.
             await self.on_ctcp(nick, target, type, contents)
         else:
@@ -84,9 +96,10 @@ class CTCPSupport(rfc1459.RFC1459Support):
             _type, response = parse_ctcp(msg)
 
             # Find dedicated handler if it exists.
-            attr = 'on_ctcp_' + pydle.protocol.identifierify(_type) + '_reply'
-            if hasattr(self, attr):
-                await getattr(self, attr)(nick, target, response)
+            attr = f'on_ctcp_{pydle.protocol.identifierify(_type)}_reply'
+            handler = getattr(self, attr, None)
+            if handler is not None:
+                await handler(nick, target, response)
             # Invoke global handler.
             await self.on_ctcp_reply(nick, target, _type, response)
         else:
@@ -97,26 +110,27 @@ class CTCPSupport(rfc1459.RFC1459Support):
 
 def is_ctcp(message):
     """ Check if message follows the CTCP format. """
-    return message.startswith(CTCP_DELIMITER) and message.endswith(CTCP_DELIMITER)
+    # Most messages aren't CTCP: bail out after a single character comparison for those.
+    return len(message) >= 2 and message[0] == CTCP_DELIMITER and message[-1] == CTCP_DELIMITER
 
 
 def construct_ctcp(*parts):
     """ Construct CTCP message. """
-    message = ' '.join(parts)
-    message = message.replace('\0', CTCP_ESCAPE_CHAR + '0')
-    message = message.replace('\n', CTCP_ESCAPE_CHAR + 'n')
-    message = message.replace('\r', CTCP_ESCAPE_CHAR + 'r')
-    message = message.replace(CTCP_ESCAPE_CHAR, CTCP_ESCAPE_CHAR + CTCP_ESCAPE_CHAR)
+    message = ' '.join(parts).translate(CTCP_ESCAPE_TABLE)
     return CTCP_DELIMITER + message + CTCP_DELIMITER
 
 
 def parse_ctcp(query):
     """ Strip and de-quote CTCP messages. """
     query = query.strip(CTCP_DELIMITER)
-    query = query.replace(CTCP_ESCAPE_CHAR + '0', '\0')
-    query = query.replace(CTCP_ESCAPE_CHAR + 'n', '\n')
-    query = query.replace(CTCP_ESCAPE_CHAR + 'r', '\r')
-    query = query.replace(CTCP_ESCAPE_CHAR + CTCP_ESCAPE_CHAR, CTCP_ESCAPE_CHAR)
-    if ' ' in query:
-        return query.split(' ', 1)
-    return query, None
+    # Hardly any message actually contains escapes.
+    if CTCP_ESCAPE_CHAR in query:
+        query = CTCP_ESCAPE_PATTERN.sub(_unescape_ctcp, query)
+    type, separator, contents = query.partition(' ')
+    if separator:
+        return type, contents
+    return type, None
+
+
+def _unescape_ctcp(match):
+    return CTCP_UNESCAPES[match.group(1)]
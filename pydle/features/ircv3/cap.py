@@ -67,8 +67,9 @@ class CapabilityNegotiationSupport(rfc1459.RFC1459Support):
 
         # Call handler.
         attr = 'on_raw_cap_' + pydle.protocol.identifierify(subcommand)
-        if hasattr(self, attr):
-            await getattr(self, attr)(params)
+        handler = getattr(self, attr, None)
+        if handler is not None:
+            await handler(params)
         else:
             self.logger.warning('Unknown CAP subcommand sent from server: %s', subcommand)
 
@@ -85,7 +86,8 @@ class CapabilityNegotiationSupport(rfc1459.RFC1459Support):
 
             # Check if we support the capability.
             attr = 'on_capability_' + pydle.protocol.identifierify(capab) + '_available'
-            supported = (await getattr(self, attr)(value)) if hasattr(self, attr) else False
+            handler = getattr(self, attr, None)
+            supported = (await handler(value)) if handler is not None else False
 
             if supported:
                 if isinstance(supported, str):
@@ -105,7 +107,7 @@ class CapabilityNegotiationSupport(rfc1459.RFC1459Support):
 
     async def on_raw_cap_list(self, params):
         """ Update active capabilities. """
-        self._capabilities = {capab: False for capab in self._capabilities}
+        self._capabilities = dict.fromkeys(self._capabilities, False)
 
         for capab in params[0].split():
             capab, value = self._capability_normalize(capab)
@@ -116,12 +118,13 @@ class CapabilityNegotiationSupport(rfc1459.RFC1459Support):
         for capab in params[0].split():
             cp, value = self._capability_normalize(capab)
             self._capabilities_requested.discard(cp)
+            prefix = capab[:1]
 
             # Determine capability type and callback.
-            if capab.startswith(DISABLED_PREFIX):
+            if prefix == DISABLED_PREFIX:
                 self._capabilities[cp] = False
                 attr = 'on_capability_' + pydle.protocol.identifierify(cp) + '_disabled'
-            elif capab.startswith(STICKY_PREFIX):
+            elif prefix == STICKY_PREFIX:
                 # Can't disable it. Do nothing.
                 self.logger.error('Could not disable capability %s.', cp)
                 continue
@@ -130,12 +133,13 @@ class CapabilityNegotiationSupport(rfc1459.RFC1459Support):
                 attr = 'on_capability_' + pydle.protocol.identifierify(cp) + '_enabled'
 
             # Indicate we're gonna use this capability if needed.
-            if capab.startswith(ACKNOWLEDGEMENT_REQUIRED_PREFIX):
+            if prefix == ACKNOWLEDGEMENT_REQUIRED_PREFIX:
                 await self.rawmsg('CAP', 'ACK', cp)
 
             # Run callback.
-            if hasattr(self, attr):
-                status = await getattr(self, attr)()
+            handler = getattr(self, attr, None)
+            if handler is not None:
+                status = await handler()
             else:
                 status = NEGOTIATED
 
@@ -167,8 +171,9 @@ class CapabilityNegotiationSupport(rfc1459.RFC1459Support):
     async def on_raw_cap_del(self, params):
         for capab in params[0].split():
             attr = 'on_capability_{}_disabled'.format(pydle.protocol.identifierify(capab))
-            if self._capabilities.get(capab, False) and hasattr(self, attr):
-                await getattr(self, attr)()
+            handler = getattr(self, attr, None)
+            if self._capabilities.get(capab, False) and handler is not None:
+                await handler()
         await self.on_raw_cap_nak(params)
 
     async def on_raw_cap_new(self, params):
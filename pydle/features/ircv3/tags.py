@@ -17,6 +17,7 @@ TAG_CONVERSIONS = {
     r"\r": '\r',
     r"\n": '\n'
 }
+TAG_ESCAPE_PATTERN = re.compile(r"(\\[\s\S])+")
 
 
 class TaggedMessage(rfc1459.RFC1459Message):
@@ -70,14 +71,13 @@ class TaggedMessage(rfc1459.RFC1459Message):
                     value = True
 
                 # Parse escape sequences since IRC escapes != python escapes
-                if isinstance(value, str):
+                if isinstance(value, str) and '\\' in value:
                     # convert known escapes first
                     for escape, replacement in TAG_CONVERSIONS.items():
                         value = value.replace(escape, replacement)
 
                     # convert other escape sequences based on the spec
-                    pattern = re.compile(r"(\\[\s\S])+")
-                    for match in pattern.finditer(value):
+                    for match in TAG_ESCAPE_PATTERN.finditer(value):
                         escape = match.group()
                         value = value.replace(escape, escape[1])
 
@@ -86,7 +86,8 @@ class TaggedMessage(rfc1459.RFC1459Message):
 
         # Parse rest of message.
         message = super().parse(message.lstrip().encode(encoding), encoding=encoding)
-        return TaggedMessage(_raw=raw, _valid=message._valid and valid, tags=tags, **message._kw)
+        return TaggedMessage(_raw=raw, _valid=message._valid and valid, _dispatch_key=message.dispatch_key, tags=tags,
+                             **message._kw)
 
     def construct(self, force=False):
         """
@@ -119,8 +120,4 @@ class TaggedMessageSupport(rfc1459.RFC1459Support):
         return TaggedMessage(tags=tags or {}, **message._kw)
 
     def _parse_message(self):
-        sep = rfc1459.protocol.MINIMAL_LINE_SEPARATOR.encode(self.encoding)
-        message, _, data = self._receive_buffer.partition(sep)
-        self._receive_buffer = data
-
-        return TaggedMessage.parse(message + sep, encoding=self.encoding)
+        return TaggedMessage.parse(self._take_line(), encoding=self.encoding)
@@ -59,8 +59,9 @@ class ISUPPORTSupport(rfc1459.RFC1459Support):
                     value = None
 
                 method = 'on_isupport_' + pydle.protocol.identifierify(entry)
-                if hasattr(self, method):
-                    await getattr(self, method)(value)
+                handler = getattr(self, method, None)
+                if handler is not None:
+                    await handler(value)
 
     ## ISUPPORT handlers.
 
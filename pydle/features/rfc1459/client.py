@@ -78,8 +78,9 @@ class RFC1459Support(BasicClient):
 
     def _create_user(self, nickname):
         super()._create_user(nickname)
-        if nickname in self.users:
-            self.users[nickname].update({
+        user = self.users.get(nickname)
+        if user is not None:
+            user.update({
                 'away': False,
                 'away_message': None,
             })
@@ -228,17 +229,24 @@ class RFC1459Support(BasicClient):
 
     def _has_message(self):
         """ Whether or not we have messages available for processing. """
-        sep = protocol.MINIMAL_LINE_SEPARATOR.encode(self.encoding)
+        sep = parsing.line_separator(self.encoding)
         return sep in self._receive_buffer
 
     def _create_message(self, command, *params, **kwargs):
         return parsing.RFC1459Message(command, params, **kwargs)
 
     def _parse_message(self):
-        sep = protocol.MINIMAL_LINE_SEPARATOR.encode(self.encoding)
-        message, _, data = self._receive_buffer.partition(sep)
-        self._receive_buffer = data
-        return parsing.RFC1459Message.parse(message + sep, encoding=self.encoding)
+        return parsing.RFC1459Message.parse(self._take_line(), encoding=self.encoding)
+
+    def _take_line(self):
+        """ Take the first complete line off the receive buffer, separator included. """
+        # Slice the line off rather than splitting it and joining the separator back on:
+        # when the buffer holds just the one line, as it does when fed line by line, both slices come for free.
+        sep = parsing.line_separator(self.encoding)
+        end = self._receive_buffer.index(sep) + len(sep)
+        line = self._receive_buffer[:end]
+        self._receive_buffer = self._receive_buffer[end:]
+        return line
 
     ## IRC API.
 
@@ -259,6 +267,31 @@ class RFC1459Support(BasicClient):
         else:
             await self.rawmsg('JOIN', channel)
 
+    async def join_multi(self, channels):
+        """
+        Join several channels at once, batching them into as few JOIN commands as possible.
+        Autojoining on connect goes through here rather than through join(), so overrides of join() don't see those channels.
+        """
+        channels = [channel for channel in channels if not self.in_channel(channel)]
+        target_limit = self._target_limits.get('JOIN')
+        # The limit is on the encoded line, in bytes. Leeway for the command and line separator.
+        length_limit = protocol.MESSAGE_LENGTH_LIMIT - len('JOIN ' + protocol.LINE_SEPARATOR)
+
+        batch = []
+        batch_length = 0
+        for channel in channels:
+            channel_length = len(channel.encode(self.encoding))
+            if batch and (batch_length + 1 + channel_length > length_limit or len(batch) == target_limit):
+                await self.rawmsg('JOIN', ','.join(batch))
+                batch = []
+                batch_length = 0
+
+            batch_length += channel_length + (1 if batch else 0)
+            batch.append(channel)
+
+        if batch:
+            await self.rawmsg('JOIN', ','.join(batch))
+
     async def part(self, channel, message=None):
         """ Leave channel, optionally with message. """
         if not self.in_channel(channel):
@@ -458,8 +491,7 @@ class RFC1459Support(BasicClient):
 
     async def on_connect(self):
         # Auto-join channels.
-        for channel in self._autojoin_channels:
-            await self.join(channel)
+        await self.join_multi(self._autojoin_channels)
 
         # super call
         await super().on_connect()
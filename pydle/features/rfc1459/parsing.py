@@ -1,20 +1,28 @@
 ## parsing.py
 # RFC1459 parsing and construction.
 import collections.abc
+import functools
 import pydle.protocol
 from . import protocol
 
 
 class RFC1459Message(pydle.protocol.Message):
-    def __init__(self, command, params, source=None, _raw=None, _valid=True, **kw):
+    def __init__(self, command, params, source=None, _raw=None, _valid=True, _dispatch_key=None, **kw):
         self._kw = kw
         self._kw['command'] = command
         self._kw['params'] = params
         self._kw['source'] = source
         self._valid = _valid
         self._raw = _raw
+        self._dispatch_key = _dispatch_key
         self.__dict__.update(self._kw)
 
+    @property
+    def dispatch_key(self):
+        if self._dispatch_key is None:
+            self._dispatch_key = super().dispatch_key
+        return self._dispatch_key
+
     @classmethod
     def parse(cls, line, encoding=pydle.protocol.DEFAULT_ENCODING):
         """
@@ -47,9 +55,9 @@ class RFC1459Message(pydle.protocol.Message):
         # Extract message sections.
         # Format: (:source)? command parameter*
         if message.startswith(':'):
-            parts = protocol.ARGUMENT_SEPARATOR.split(message[1:], 2)
+            parts = split_arguments(message[1:], 2)
         else:
-            parts = [None] + protocol.ARGUMENT_SEPARATOR.split(message, 1)
+            parts = [None] + split_arguments(message, 1)
 
         if len(parts) == 3:
             source, command, raw_params = parts
@@ -59,8 +67,8 @@ class RFC1459Message(pydle.protocol.Message):
         else:
             raise pydle.protocol.ProtocolViolation('Improper IRC message format: not enough elements.', message=message)
 
-        # Sanity check for command.
-        if not protocol.COMMAND_PATTERN.match(command):
+        # Sanity check for command: either letters or digits, ASCII only. Same as COMMAND_PATTERN, minus the regex engine.
+        if not (command and max(command) < '\x80' and (command.isalpha() or command.isdigit())):
             valid = False
 
         # Extract parameters properly.
@@ -74,12 +82,12 @@ class RFC1459Message(pydle.protocol.Message):
             index = raw_params.find(' ' + protocol.TRAILING_PREFIX)
 
             # Get all single-word parameters.
-            params = protocol.ARGUMENT_SEPARATOR.split(raw_params[:index].rstrip(' '))
+            params = split_arguments(raw_params[:index].rstrip(' '))
             # Extract last parameter as sentence
             params.append(raw_params[index + len(protocol.TRAILING_PREFIX) + 1:])
         # We have some parameters, but no sentences.
         elif raw_params:
-            params = protocol.ARGUMENT_SEPARATOR.split(raw_params)
+            params = split_arguments(raw_params)
         # No parameters.
         else:
             params = []
@@ -87,13 +95,16 @@ class RFC1459Message(pydle.protocol.Message):
         # Commands can be either [a-zA-Z]+ or [0-9]+.
         # In the former case, force it to uppercase.
         # In the latter case (a numeric command), try to represent it as such.
-        try:
+        # Derive the handler dispatch key from the raw token while we have it, so it doesn't need to be recomputed later.
+        if command.isdecimal():
+            dispatch_key = command.zfill(3)
             command = int(command)
-        except ValueError:
+        else:
+            dispatch_key = command.lower()
             command = command.upper()
 
         # Return parsed message.
-        return RFC1459Message(command, params, source=source, _valid=valid, _raw=message)
+        return RFC1459Message(command, params, source=source, _valid=valid, _raw=message, _dispatch_key=dispatch_key)
 
     def construct(self, force=False):
         """ Construct a raw IRC message. """
@@ -183,6 +194,21 @@ class NormalizingDict(collections.abc.MutableMapping):
 
 # Parsing.
 
+@functools.lru_cache(maxsize=None)
+def line_separator(encoding):
+    """ Minimal line separator as it appears in data of given encoding. """
+    return protocol.MINIMAL_LINE_SEPARATOR.encode(encoding)
+
+
+def split_arguments(raw, maxsplit=-1):
+    """ Split raw argument string on runs of spaces, optionally at most maxsplit times. """
+    # As long as arguments are separated by single spaces, a plain str.split() gives the same result as the
+    # separator pattern without going through the regex engine. Only fall back to the pattern otherwise.
+    if '  ' in raw:
+        return protocol.ARGUMENT_SEPARATOR.split(raw, max(maxsplit, 0))
+    return raw.split(' ', maxsplit)
+
+
 def parse_user(raw):
     """ Parse nick(!user(@host)?)? structure. """
     nick = raw
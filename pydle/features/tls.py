@@ -34,7 +34,7 @@ class TLSSupport(rfc1459.RFC1459Support):
                 port = rfc1459.protocol.DEFAULT_PORT
         return await super().connect(hostname, port, tls=tls, **kwargs)
 
-    async def _connect(self, hostname, port, reconnect=False, password=None, encoding=pydle.protocol.DEFAULT_ENCODING, channels=None, tls=False, tls_verify=False, source_address=None):
+    async def _connect(self, hostname, port, reconnect=False, password=None, encoding=pydle.protocol.DEFAULT_ENCODING, channels=None, tls=False, tls_verify=False, source_address=None, sockopts=None):
         """ Connect to IRC server, optionally over TLS. """
         self.password = password
 
@@ -42,7 +42,7 @@ class TLSSupport(rfc1459.RFC1459Support):
         if not reconnect:
             self._autojoin_channels = channels or []
             self.connection = connection.Connection(hostname, port,
-                source_address=source_address,
+                source_address=source_address, sockopts=sockopts,
                 tls=tls, tls_verify=tls_verify,
                 tls_certificate_file=self.tls_client_cert,
                 tls_certificate_keyfile=self.tls_client_cert_key,
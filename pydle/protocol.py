@@ -1,6 +1,7 @@
 ## protocol.py
 # IRC implementation-agnostic constants/helpers.
-import re
+import functools
+import string
 from abc import abstractmethod
 
 DEFAULT_ENCODING = 'utf-8'
@@ -31,14 +32,32 @@ class Message:
         """ Convert message into raw IRC command. If `force` is True, don't attempt to check message validity. """
         raise NotImplementedError()
 
+    @property
+    def dispatch_key(self):
+        """ The key handlers for this message are looked up by: the lowercase command, or the three-digit numeric. """
+        if isinstance(self.command, int):
+            return str(self.command).zfill(3)
+        return self.command.lower()
+
     def __str__(self):
         return self.construct()
 
 ## Misc.
 
+class _IdentifierTable(dict):
+    """ Translation table for identifierify(): anything but lowercase ASCII letters and digits becomes an underscore. """
+    def __missing__(self, char):
+        return '_'
+
+
+# Spell out ASCII up front, so common names are translated without calling back into __missing__().
+IDENTIFIER_TABLE = _IdentifierTable(
+    (char, chr(char) if chr(char) in string.ascii_lowercase + string.digits else '_') for char in range(128)
+)
+
 
+# The same few capability, CTCP and ISUPPORT names come by over and over again.
+@functools.lru_cache(maxsize=256)
 def identifierify(name):
     """ Clean up name so it works for a Python identifier. """
-    name = name.lower()
-    name = re.sub('[^a-z0-9]', '_', name)
-    return name
+    return name.lower().translate(IDENTIFIER_TABLE)
@@ -1,3 +1,4 @@
+import asyncio
 import pydle
 from .mocks import MockServer, MockClient
 
@@ -24,3 +25,19 @@ def with_client(*features, connected=True, **options):
 
 
 with_client.classes = {}
+
+
+async def create_client(*features, connected=True, **options):
+    """ Set up a mock server and a client connected to it, for tests that drive the client themselves. """
+    if not features:
+        features = (pydle.client.BasicClient,)
+    if features not in with_client.classes:
+        with_client.classes[features] = pydle.featurize(MockClient, *features)
+
+    server = MockServer()
+    # Share the test's event loop, so disconnecting doesn't try to stop it.
+    options.setdefault("eventloop", asyncio.get_event_loop())
+    client = with_client.classes[features]("TestcaseRunner", mock_server=server, **options)
+    if connected:
+        await client.connect("mock://local", 1337)
+    return server, client
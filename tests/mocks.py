@@ -1,3 +1,4 @@
+import asyncio
 import json
 import pydle
 
@@ -41,7 +42,7 @@ class MockServer:
         await self.connection._mock_client.on_raw(msg)
 
     def sendraw(self, data):
-        self.connection._mock_client.on_data(data)
+        self.connection.reader.feed_data(data)
 
 
 class MockClient(pydle.client.BasicClient):
@@ -60,7 +61,8 @@ class MockClient(pydle.client.BasicClient):
     def logger(self, val):
         pass
 
-    async def _connect(self, hostname, port, *args, **kwargs):
+    async def _connect(self, hostname, port, *args, encoding=pydle.protocol.DEFAULT_ENCODING, **kwargs):
+        self.encoding = encoding
         self.connection = MockConnection(
             hostname,
             port,
@@ -109,6 +111,8 @@ class MockConnection(pydle.connection.Connection):
         return self._mock_connected
 
     async def connect(self, *args, **kwargs):
+        # Raw data the server sends goes through the regular receive path.
+        self.reader = asyncio.StreamReader(limit=pydle.connection.PARTIAL_LINE_LIMIT)
         self._mock_server.connection = self
         self._mock_connected = True
 
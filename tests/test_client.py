@@ -1,8 +1,9 @@
+import asyncio
 import time
 import pytest
 from pytest import raises, mark
 import pydle
-from .fixtures import with_client
+from .fixtures import with_client, create_client
 from .mocks import Mock
 
 pydle.client.PING_TIMEOUT = 10
@@ -60,6 +61,60 @@ async def test_client_unexpected_disconnect_reconnect_delay(server, client):
     assert client.connected
 
 
+@pytest.mark.asyncio
+async def test_client_oversized_line_reconnects_once():
+    server, client = await create_client(connected=False)
+    client._reconnect_delay = Mock(return_value=0)
+
+    # Keep track of the receive loops, and of how they end.
+    running = []
+    ended = []
+    loop_ended = asyncio.Event()
+    handle_forever = client.handle_forever
+
+    async def tracked_handle_forever():
+        connection = client.connection
+        running.append(connection)
+        try:
+            await handle_forever()
+        except Exception as e:
+            ended.append(e)
+            raise
+        else:
+            ended.append(None)
+        finally:
+            running.remove(connection)
+            loop_ended.set()
+    client.handle_forever = tracked_handle_forever
+
+    disconnects = []
+    on_disconnect = client.on_disconnect
+
+    async def record_disconnect(expected):
+        disconnects.append(expected)
+        await on_disconnect(expected)
+    client.on_disconnect = record_disconnect
+
+    await client.connect("mock://local", 1337)
+    first_connection = client.connection
+    server.sendraw(b"x" * (pydle.connection.PARTIAL_LINE_LIMIT + 1))
+    await asyncio.wait_for(loop_ended.wait(), timeout=1)
+
+    connection = client.connection
+    try:
+        assert disconnects == [False]
+        assert client.connected
+        assert connection is not first_connection
+        # The old receive loop must have ended cleanly, leaving only the one started by the reconnect.
+        assert ended == [None]
+        assert running == [connection]
+    finally:
+        loop_ended.clear()
+        await client.disconnect(expected=True)
+        connection.reader.feed_eof()
+        await asyncio.wait_for(loop_ended.wait(), timeout=1)
+
+
 @pytest.mark.asyncio
 @with_client()
 def test_client_reconnect_delay_calculation(server, client):
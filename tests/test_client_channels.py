@@ -1,5 +1,7 @@
 import pytest
-from .fixtures import with_client
+import pydle
+from pydle.features.rfc1459 import protocol
+from .fixtures import with_client, create_client
 
 
 @pytest.mark.asyncio
@@ -52,3 +54,57 @@ async def test_channel_user_destruction(server, client):
     client._destroy_channel("#pydle")
     assert "#pydle" not in client.channels
     assert "WiZ" not in client.users
+
+
+## Joining several channels at once.
+
+async def join_multi(channels, joined=(), target_limit=None):
+    """ Join channels through join_multi() and return the JOIN commands sent for it. """
+    server, client = await create_client(pydle.features.RFC1459Support)
+    try:
+        for channel in joined:
+            client._create_channel(channel)
+        if target_limit:
+            client._target_limits['JOIN'] = target_limit
+
+        server.msgbuffer.clear()
+        await client.join_multi(channels)
+        return [args for args, kwargs in server.msgbuffer]
+    finally:
+        await client.disconnect(expected=True)
+
+
+@pytest.mark.asyncio
+async def test_client_join_multi_batches():
+    assert await join_multi(["#a", "#b", "#c"]) == [("JOIN", "#a,#b,#c")]
+
+
+@pytest.mark.asyncio
+async def test_client_join_multi_length_limit():
+    # The limit is in bytes: non-ASCII names take up more of it than their length suggests.
+    for channels in (["#channel{:03}".format(i) for i in range(100)],
+                     ["#" + "\u00fc" * 40 + str(i) for i in range(30)]):
+        sent = await join_multi(channels)
+
+        assert len(sent) > 1
+        assert [channel for _, targets in sent for channel in targets.split(",")] == channels
+        for command, targets in sent:
+            assert len((command + " " + targets + protocol.LINE_SEPARATOR).encode()) <= protocol.MESSAGE_LENGTH_LIMIT
+
+
+@pytest.mark.asyncio
+async def test_client_join_multi_target_limit():
+    sent = await join_multi(["#a", "#b", "#c", "#d", "#e"], target_limit=2)
+    assert sent == [("JOIN", "#a,#b"), ("JOIN", "#c,#d"), ("JOIN", "#e")]
+
+
+@pytest.mark.asyncio
+async def test_client_join_multi_skips_joined():
+    sent = await join_multi(["#a", "#b", "#c"], joined=["#b"])
+    assert sent == [("JOIN", "#a,#c")]
+
+
+@pytest.mark.asyncio
+async def test_client_join_multi_empty():
+    assert await join_multi([]) == []
+    assert await join_multi(["#a"], joined=["#a"]) == []
@@ -1,5 +1,6 @@
 import pytest
-from .fixtures import with_client
+import pydle
+from .fixtures import with_client, create_client
 
 
 @pytest.mark.asyncio
@@ -138,3 +139,24 @@ async def test_user_mask_format(server, client):
 
     await client._sync_user("WiZ", {"username": None})
     assert client._format_user_mask("WiZ") == "WiZ!*@og.irc.developer"
+
+
+@pytest.mark.asyncio
+async def test_user_mask_cache():
+    server, client = await create_client(pydle.features.RFC1459Support)
+    try:
+        client._create_user("WiZ")
+        await client._sync_user("WiZ", {"username": "wiz", "hostname": "og.irc.developer"})
+        assert client._format_user_mask("WiZ") == "WiZ!wiz@og.irc.developer"
+        assert client.users["WiZ"]["_hostmask"] == "WiZ!wiz@og.irc.developer"
+
+        # Syncing the user drops the formatted mask, as does renaming them.
+        await client._sync_user("WiZ", {"hostname": "irc.developer"})
+        assert client.users["WiZ"]["_hostmask"] is None
+        assert client._format_user_mask("WiZ") == "WiZ!wiz@irc.developer"
+
+        await client._rename_user("WiZ", "jilles")
+        assert client.users["jilles"]["_hostmask"] is None
+        assert client._format_user_mask("jilles") == "jilles!wiz@irc.developer"
+    finally:
+        await client.disconnect(expected=True)
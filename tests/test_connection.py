@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+from pytest import raises
+import pydle
+from pydle.connection import Connection, PARTIAL_LINE_LIMIT, SEND_BUFFER_HIGH_WATER
+from .mocks import Mock
+
+
+async def local_server():
+    """ Start a local server and connect to it. Returns the server, the connection and the server's side of it. """
+    peers = asyncio.Queue()
+
+    async def accept(reader, writer):
+        await peers.put((reader, writer))
+
+    server = await asyncio.start_server(accept, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    connection = Connection('127.0.0.1', port, eventloop=asyncio.get_event_loop())
+    await connection.connect()
+    peer = await peers.get()
+    return server, connection, peer
+
+
+async def close(server, connection, peer):
+    await connection.disconnect()
+    peer[1].close()
+    server.close()
+    await server.wait_closed()
+
+
+## Receiving.
+
+@pytest.mark.asyncio
+async def test_connection_recv_split_line():
+    server, connection, (reader, writer) = await local_server()
+    try:
+        writer.write(b'PING :ab')
+        await writer.drain()
+        recv = asyncio.ensure_future(connection.recv(timeout=1))
+        await asyncio.sleep(0.05)
+        assert not recv.done()
+
+        writer.write(b'cd\r\n')
+        assert await recv == b'PING :abcd\r\n'
+    finally:
+        await close(server, connection, (reader, writer))
+
+
+@pytest.mark.asyncio
+async def test_connection_recv_multiple_lines():
+    server, connection, (reader, writer) = await local_server()
+    try:
+        writer.write(b'PING :1\r\nPING :2\r\nPING :3\r\n')
+        assert await connection.recv(timeout=1) == b'PING :1\r\n'
+        assert await connection.recv(timeout=1) == b'PING :2\r\n'
+        assert await connection.recv(timeout=1) == b'PING :3\r\n'
+    finally:
+        await close(server, connection, (reader, writer))
+
+
+@pytest.mark.asyncio
+async def test_connection_recv_partial_line_at_eof():
+    server, connection, (reader, writer) = await local_server()
+    try:
+        writer.write(b'PING :1\r\nPING :2')
+        writer.close()
+        assert await connection.recv(timeout=1) == b'PING :1\r\n'
+        assert await connection.recv(timeout=1) == b'PING :2'
+        assert await connection.recv(timeout=1) == b''
+    finally:
+        await close(server, connection, (reader, writer))
+
+
+@pytest.mark.asyncio
+async def test_connection_recv_oversized_line():
+    server, connection, (reader, writer) = await local_server()
+    try:
+        writer.write(b'x' * (PARTIAL_LINE_LIMIT + 1))
+        with raises(pydle.protocol.ProtocolViolation):
+            while True:
+                await connection.recv(timeout=1)
+    finally:
+        await close(server, connection, (reader, writer))
+
+
+## Sending.
+
+@pytest.mark.asyncio
+async def test_connection_send_coalesced():
+    server, connection, (reader, writer) = await local_server()
+    try:
+        connection.writer.write = Mock(wraps=connection.writer.write)
+        await connection.send(b'PRIVMSG #a :1\r\n')
+        await connection.send(b'PRIVMSG #a :2\r\n')
+        assert not connection.writer.write.called
+
+        await asyncio.sleep(0)
+        connection.writer.write.assert_called_once_with(b'PRIVMSG #a :1\r\nPRIVMSG #a :2\r\n')
+        assert await reader.readline() == b'PRIVMSG #a :1\r\n'
+        assert await reader.readline() == b'PRIVMSG #a :2\r\n'
+    finally:
+        await close(server, connection, (reader, writer))
+
+
+@pytest.mark.asyncio
+async def test_connection_send_blocks_when_peer_does_not_read():
+    server, connection, (reader, writer) = await local_server()
+    line = b'PRIVMSG #a :' + b'x' * 386 + b'\r\n'
+
+    async def flood():
+        for _ in range(100000):
+            await connection.send(line)
+            await asyncio.sleep(0)
+
+    sender = asyncio.ensure_future(flood())
+    try:
+        # Once the socket buffers have filled up, the sender should be held up rather than queue without bound.
+        await asyncio.sleep(0.5)
+        assert not sender.done()
+        assert connection.writer.transport.get_write_buffer_size() <= 2 * SEND_BUFFER_HIGH_WATER
+    finally:
+        sender.cancel()
+        connection.writer.transport.abort()
+        await close(server, connection, (reader, writer))
+
+
+@pytest.mark.asyncio
+async def test_connection_send_not_connected():
+    connection = Connection('127.0.0.1', 6667)
+    with raises(ConnectionError):
+        await connection.send(b'QUIT\r\n')
+
+
+@pytest.mark.asyncio
+async def test_connection_disconnect_flushes_send_buffer():
+    server, connection, (reader, writer) = await local_server()
+    try:
+        await connection.send(b'QUIT :bye\r\n')
+        await connection.disconnect()
+        assert not connection.connected
+        assert await asyncio.wait_for(reader.read(), timeout=1) == b'QUIT :bye\r\n'
+    finally:
+        await close(server, connection, (reader, writer))
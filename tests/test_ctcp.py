@@ -0,0 +1,40 @@
+import pytest
+
+from pydle.features import ctcp
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    "parts, expected",
+    [
+        (("VERSION",), "\x01VERSION\x01"),
+        (("PING", "12345"), "\x01PING 12345\x01"),
+        (("ACTION", "a\nb\rc\0d\x16e"), "\x01ACTION a\x16nb\x16rc\x160d\x16\x16e\x01"),
+    ],
+)
+def test_construct_ctcp(parts, expected):
+    assert ctcp.construct_ctcp(*parts) == expected
+
+
+@pytest.mark.parametrize(
+    "contents",
+    ["plain", "\0", "\x160", "a\nb\rc\0d\x16e", "\x16\x16\x160"],
+)
+def test_ctcp_roundtrip(contents):
+    assert ctcp.parse_ctcp(ctcp.construct_ctcp("ACTION", contents)) == ("ACTION", contents)
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("\x01VERSION\x01", True),
+        ("\x01\x01", True),
+        ("hello", False),
+        ("", False),
+        ("\x01", False),
+        ("\x01VERSION", False),
+    ],
+)
+def test_is_ctcp(message, expected):
+    assert ctcp.is_ctcp(message) == expected
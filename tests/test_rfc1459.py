@@ -0,0 +1,45 @@
+import pytest
+
+from pydle.features.rfc1459 import parsing
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        (
+            rb":irc.example.com 001 WiZ :Welcome to the network",
+            ("irc.example.com", 1, ["WiZ", "Welcome to the network"]),
+        ),
+        (
+            rb":WiZ!wiz@og.irc.developer PRIVMSG #lobby :hello  there",
+            ("WiZ!wiz@og.irc.developer", "PRIVMSG", ["#lobby", "hello  there"]),
+        ),
+        (
+            rb"PING :irc.example.com",
+            (None, "PING", ["irc.example.com"]),
+        ),
+        (
+            rb":irc.example.com   MODE  #lobby   +o  WiZ",
+            ("irc.example.com", "MODE", ["#lobby", "+o", "WiZ"]),
+        ),
+    ],
+)
+def test_message_parse(payload, expected):
+    message = parsing.RFC1459Message.parse(payload)
+
+    assert (message.source, message.command, message.params) == expected
+
+
+@pytest.mark.parametrize(
+    "payload, valid",
+    [
+        (rb"PRIVMSG #lobby :hi", True),
+        (rb"001 WiZ :Welcome", True),
+        (rb"PRIV2MSG #lobby :hi", False),
+        (rb"\xd9\xa1 WiZ :Welcome", False),
+    ],
+)
+def test_message_command_validity(payload, valid):
+    assert parsing.RFC1459Message.parse(payload)._valid == valid